@@ -20,6 +20,44 @@ import json
 import math
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import cupy as cp
+except ImportError:  # необязательная зависимость, есть чистый NumPy-путь
+    cp = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # необязательная зависимость, есть чистый NumPy-путь
+    njit = prange = None
+
+try:
+    import ijson
+except ImportError:  # необязательная зависимость, json.load как запасной вариант
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # необязательная зависимость, stdlib json как запасной вариант
+    orjson = None
+
+
+def _dumps(obj) -> bytes:
+    """Сериализует результат в JSON-байты (orjson при наличии, иначе stdlib)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(
+        obj, indent=2, ensure_ascii=False, separators=(",", ": ")
+    ).encode("utf-8")
+
+
+# LUT: код ASCII-символа -> значение hex-цифры (0-15)
+_HEX_NIB_LUT = np.zeros(256, dtype=np.uint8)
+_HEX_NIB_LUT[ord("0") : ord("9") + 1] = np.arange(10, dtype=np.uint8)
+_HEX_NIB_LUT[ord("a") : ord("f") + 1] = np.arange(10, 16, dtype=np.uint8)
+_HEX_NIB_LUT[ord("A") : ord("F") + 1] = np.arange(10, 16, dtype=np.uint8)
+
 
 def hex_to_rgb(hex_str: str) -> tuple[int, int, int]:
     """#RRGGBB или RRGGBB -> (255, 255, 255)"""
@@ -29,6 +67,20 @@ def hex_to_rgb(hex_str: str) -> tuple[int, int, int]:
     return (int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16))
 
 
+def hex_to_rgb_batch(hex_list: list[str]) -> np.ndarray:
+    """Список "#rrggbb" -> массив uint8 (N, 3)
+
+    Вместо int(h[i:j], 16) на каждый цвет: один буфер символов,
+    LUT ASCII->нибл и пара векторных операций на всю палитру.
+    """
+    n = len(hex_list)
+    chars = np.frombuffer(
+        "".join(h[1:] for h in hex_list).encode("ascii"), dtype=np.uint8
+    ).reshape(n, 6)
+    nib = _HEX_NIB_LUT[chars]
+    return (nib[:, 0::2] << 4) | nib[:, 1::2]
+
+
 def rgb_to_hsl(rgb: tuple[int, int, int]) -> tuple[float, float, float]:
     """RGB -> HSL (H:0-360, S:0-100, L:0-100)"""
     r, g, b = [x / 255.0 for x in rgb]
@@ -75,23 +127,76 @@ def rgb_to_hsv(rgb: tuple[int, int, int]) -> tuple[float, float, float]:
     return (round(h, 1), round(s, 1), round(v, 1))
 
 
+def _hue_batch(r, g, b, xp=np):
+    """Тон для массивов каналов (N,): 0-360, 0 при d == 0"""
+    mx = xp.maximum(xp.maximum(r, g), b)
+    d = mx - xp.minimum(xp.minimum(r, g), b)
+    d_safe = xp.where(d == 0, 1.0, d)
+    h = xp.where(
+        mx == r,
+        ((g - b) / d_safe) % 6,
+        xp.where(mx == g, (b - r) / d_safe + 2, (r - g) / d_safe + 4),
+    )
+    return xp.where(d == 0, 0.0, h * 60)
+
+
+def rgb_to_hsl_batch(rgb, xp=np):
+    """RGB uint8 (N, 3) -> HSL (N, 3), без округления
+
+    Скалярные ветки if mx == r... заменены на xp.where по всей палитре;
+    xp - numpy или cupy.
+    """
+    r, g, b = (rgb / 255.0).T
+    mx = xp.maximum(xp.maximum(r, g), b)
+    mn = xp.minimum(xp.minimum(r, g), b)
+    d = mx - mn
+    l = (mx + mn) / 2
+
+    den = xp.where(l > 0.5, 2 - mx - mn, mx + mn)
+    s = xp.where(d == 0, 0.0, d / xp.where(den == 0, 1.0, den))
+
+    h = _hue_batch(r, g, b, xp)
+    return xp.stack([h, s * 100, l * 100], axis=1)
+
+
+def rgb_to_hsv_batch(rgb, xp=np):
+    """RGB uint8 (N, 3) -> HSV (N, 3), без округления"""
+    r, g, b = (rgb / 255.0).T
+    mx = xp.maximum(xp.maximum(r, g), b)
+    d = mx - xp.minimum(xp.minimum(r, g), b)
+
+    v = mx * 100
+    s = xp.where(mx == 0, 0.0, d / xp.where(mx == 0, 1.0, mx) * 100)
+
+    h = _hue_batch(r, g, b, xp)
+    return xp.stack([h, s, v], axis=1)
+
+
+# Константы скалярного Lab-пути: умножение вместо деления и без
+# пересоздания замыкания f(t) на каждый вызов
+_INV_255 = 1 / 255.0
+_INV_WPX = 1 / 0.95047
+_INV_WPZ = 1 / 1.08883
+_ONE_THIRD = 1.0 / 3.0
+
+
+def _flab(t: float) -> float:
+    return t**_ONE_THIRD if t > 0.008856 else 7.787 * t + 16 / 116
+
+
 def rgb_to_lab(rgb: tuple[int, int, int]) -> tuple[float, float, float]:
     """RGB -> CIELAB"""
-    r, g, b = [x / 255.0 for x in rgb]
+    r, g, b = [x * _INV_255 for x in rgb]
 
     r = r / 12.92 if r <= 0.04045 else ((r + 0.055) / 1.055) ** 2.4
     g = g / 12.92 if g <= 0.04045 else ((g + 0.055) / 1.055) ** 2.4
     b = b / 12.92 if b <= 0.04045 else ((b + 0.055) / 1.055) ** 2.4
 
-    x = r * 0.4124564 + g * 0.3575761 + b * 0.1804375
+    x = (r * 0.4124564 + g * 0.3575761 + b * 0.1804375) * _INV_WPX
     y = r * 0.2126729 + g * 0.7151522 + b * 0.0721750
-    z = r * 0.0193339 + g * 0.1191920 + b * 0.9503041
-
-    x /= 0.95047
-    z /= 1.08883
+    z = (r * 0.0193339 + g * 0.1191920 + b * 0.9503041) * _INV_WPZ
 
-    f = lambda t: t ** (1 / 3) if t > 0.008856 else 7.787 * t + 16 / 116
-    fx, fy, fz = f(x), f(y), f(z)
+    fx, fy, fz = _flab(x), _flab(y), _flab(z)
 
     l = max(0, 116 * fy - 16)
     a = 500 * (fx - fy)
@@ -100,6 +205,95 @@ def rgb_to_lab(rgb: tuple[int, int, int]) -> tuple[float, float, float]:
     return (round(l, 2), round(a, 2), round(b_lab, 2))
 
 
+# sRGB -> XYZ (D65) и белая точка для батч-версии
+_LAB_M = np.array(
+    [
+        [0.4124564, 0.3575761, 0.1804375],
+        [0.2126729, 0.7151522, 0.0721750],
+        [0.0193339, 0.1191920, 0.9503041],
+    ]
+)
+_LAB_WP = np.array([0.95047, 1.0, 1.08883])
+
+# Веса Rec.709 для яркости
+_LUMA_W = np.array([0.2126, 0.7152, 0.0722])
+
+# Порог, с которого ядра имеет смысл гонять на GPU: ниже него стоимость
+# запуска ядер и пересылок съедает выигрыш
+_GPU_MIN_COLORS = 50_000
+
+# Вход всегда uint8, поэтому гамму считаем один раз на 256 значений:
+# дальше линеаризация - это просто выборка по индексу
+_i = np.arange(256) / 255.0
+SRGB_LIN_LUT = np.where(_i <= 0.04045, _i / 12.92, ((_i + 0.055) / 1.055) ** 2.4)
+NORM_LUT = _i.round(4)
+del _i
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _lab_kernel_nb(rgb, lut, out):  # pragma: no cover - требует numba
+        """Тот же Lab-расчёт, но JIT-цикл с prange по цветам"""
+        for i in prange(rgb.shape[0]):
+            r = lut[rgb[i, 0]]
+            g = lut[rgb[i, 1]]
+            b = lut[rgb[i, 2]]
+
+            x = (r * 0.4124564 + g * 0.3575761 + b * 0.1804375) / 0.95047
+            y = r * 0.2126729 + g * 0.7151522 + b * 0.0721750
+            z = (r * 0.0193339 + g * 0.1191920 + b * 0.9503041) / 1.08883
+
+            fx = np.cbrt(x) if x > 0.008856 else 7.787 * x + 16 / 116
+            fy = np.cbrt(y) if y > 0.008856 else 7.787 * y + 16 / 116
+            fz = np.cbrt(z) if z > 0.008856 else 7.787 * z + 16 / 116
+
+            out[i, 0] = max(0.0, 116 * fy - 16)
+            out[i, 1] = 500 * (fx - fy)
+            out[i, 2] = 200 * (fy - fz)
+
+else:
+    _lab_kernel_nb = None
+
+
+_GPU_CONSTS = None
+
+
+def _gpu_consts():
+    """Копии SRGB_LIN_LUT/_LAB_M/_LAB_WP на GPU (создаются один раз)"""
+    global _GPU_CONSTS
+    if _GPU_CONSTS is None:
+        _GPU_CONSTS = (cp.asarray(SRGB_LIN_LUT), cp.asarray(_LAB_M), cp.asarray(_LAB_WP))
+    return _GPU_CONSTS
+
+
+def rgb_to_lab_batch(rgb, xp=np):
+    """RGB uint8 (N, 3) -> CIELAB (N, 3), без округления
+
+    Линеаризация sRGB - выборка из SRGB_LIN_LUT по uint8, матрица M
+    одним matmul, кубический корень через np.cbrt вместо ** (1/3).
+    При наличии numba работает JIT-версия цикла с параллелизмом по N.
+    """
+    if xp is np:
+        if _lab_kernel_nb is not None:
+            out = np.empty((rgb.shape[0], 3))
+            _lab_kernel_nb(np.ascontiguousarray(rgb), SRGB_LIN_LUT, out)
+            return out
+        lut, m, wp = SRGB_LIN_LUT, _LAB_M, _LAB_WP
+    else:
+        lut, m, wp = _gpu_consts()
+
+    c_lin = lut[rgb]
+
+    xyz = c_lin @ m.T / wp
+    f = xp.where(xyz > 0.008856, xp.cbrt(xyz), 7.787 * xyz + 16 / 116)
+
+    l = xp.maximum(0, 116 * f[:, 1] - 16)
+    a = 500 * (f[:, 0] - f[:, 1])
+    b_lab = 200 * (f[:, 1] - f[:, 2])
+    return xp.stack([l, a, b_lab], axis=1)
+
+
 def rgb_to_cmyk(rgb: tuple[int, int, int]) -> tuple[float, float, float, float]:
     """RGB -> CMYK (0-100%)"""
     r, g, b = [x / 255.0 for x in rgb]
@@ -119,11 +313,39 @@ def rgb_to_cmyk(rgb: tuple[int, int, int]) -> tuple[float, float, float, float]:
     return (round(c * 100, 1), round(m * 100, 1), round(y * 100, 1), round(k * 100, 1))
 
 
+def rgb_to_cmyk_batch(rgb, xp=np):
+    """RGB uint8 (N, 3) -> CMYK (N, 4), 0-100%, без округления"""
+    r, g, b = (rgb / 255.0).T
+    k = 1 - xp.maximum(xp.maximum(r, g), b)
+    inv = xp.where(k == 1, 1.0, 1 - k)
+
+    c = xp.where(k == 1, 0.0, (1 - r - k) / inv)
+    m = xp.where(k == 1, 0.0, (1 - g - k) / inv)
+    y = xp.where(k == 1, 0.0, (1 - b - k) / inv)
+    return xp.stack([c, m, y, k], axis=1) * 100
+
+
+_HEX_CHARS = frozenset("0123456789abcdefABCDEF")
+# Таблица для str.translate: удаляет все не-hex символы (Latin-1 диапазон)
+_HEX_DEL_TBL = str.maketrans(
+    "", "", "".join(chr(c) for c in range(256) if chr(c) not in _HEX_CHARS)
+)
+
+
 def normalize_hex(color_str: str) -> str:
     """Приводит к формату #RRGGBB (нижний регистр)"""
-    import re
-
-    hex_clean = re.sub(r"[^0-9A-Fa-f]", "", color_str)
+    # Быстрый путь: типичный вход уже в виде "#RRGGBB"
+    if (
+        len(color_str) == 7
+        and color_str[0] == "#"
+        and _HEX_CHARS.issuperset(color_str[1:])
+    ):
+        return color_str.lower()
+
+    hex_clean = color_str.translate(_HEX_DEL_TBL)
+    if not _HEX_CHARS.issuperset(hex_clean):
+        # Редкий случай: не-hex символы за пределами Latin-1
+        hex_clean = "".join(c for c in hex_clean if c in _HEX_CHARS)
 
     if len(hex_clean) == 3:
         hex_clean = "".join(c * 2 for c in hex_clean)
@@ -133,26 +355,54 @@ def normalize_hex(color_str: str) -> str:
     return f"#{hex_clean.lower()}"
 
 
-def extract_hex(text: str) -> str:
-    """Извлекает HEX цвет из начала строки"""
-    text = text.lstrip(";#|: \t")
+# LUT: байт -> hex-цифра (0-15), 0xFF для не-hex байтов
+_NIB = bytearray([0xFF] * 256)
+for _c, _v in zip(b"0123456789abcdef", range(16)):
+    _NIB[_c] = _v
+    if _v >= 10:
+        _NIB[_c - 32] = _v  # заглавные A-F
+del _c, _v
 
-    for i in range(min(7, len(text)), 0, -1):
-        test_str = text[:i]
-        hex_color = normalize_hex(test_str)
-        if hex_color:
-            return hex_color
 
+def extract_hex(text: str) -> str:
+    """Извлекает HEX цвет из начала строки
+
+    Один проход по байтам вместо перебора префиксов с normalize_hex:
+    собираем подряд идущие hex-цифры с начала, 6 -> #rrggbb, 3 -> #rgb.
+    """
+    b = text.encode("utf-8", "ignore").lstrip(b";#|: \t")
+
+    n = 0
+    for ch in b[:6]:
+        if _NIB[ch] == 0xFF:
+            break
+        n += 1
+
+    if n == 6:
+        return "#" + b[:6].decode("ascii").lower()
+    if n >= 3:
+        return "#" + "".join(c * 2 for c in b[:3].decode("ascii").lower())
     return None
 
 
+def _iter_json_items(file_path: str):
+    """Отдаёт элементы корневого массива по одному
+
+    С ijson входной файл читается потоково и не материализуется целиком
+    в памяти; без него - обычный json.load.
+    """
+    if ijson is not None:
+        with open(file_path, "rb") as f:
+            yield from ijson.items(f, "item")
+    else:
+        with open(file_path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+
+
 def parse_json_file(file_path: str) -> list[dict]:
     """Парсит JSON файл со структурой [{"id", "name", "color"}, ...]"""
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
     colors = []
-    for i, item in enumerate(data, 1):
+    for i, item in enumerate(_iter_json_items(file_path), 1):
         if not isinstance(item, dict):
             continue
 
@@ -182,29 +432,28 @@ def parse_json_file(file_path: str) -> list[dict]:
 
 def parse_text_file(file_path: str) -> list[dict]:
     """Парсит текстовый файл: одна строка = один цвет"""
-    with open(file_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
     colors = []
-    for i, line in enumerate(lines, 1):
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
+    # Читаем байтами: пустые строки и комментарии отсеиваем до декодирования
+    with open(file_path, "rb") as f:
+        for i, raw in enumerate(f.read().splitlines(), 1):
+            raw = raw.strip()
+            if not raw or raw.startswith(b"#"):
+                continue
 
-        parts = line.split()
-        if not parts:
-            continue
+            parts = raw.decode("utf-8", "replace").split()
+            if not parts:
+                continue
 
-        first_part = parts[0]
-        hex_color = extract_hex(first_part)
+            first_part = parts[0]
+            hex_color = extract_hex(first_part)
 
-        if not hex_color:
-            continue
+            if not hex_color:
+                continue
 
-        name_parts = parts[1:]
-        color_name = " ".join(name_parts) if name_parts else hex_color
+            name_parts = parts[1:]
+            color_name = " ".join(name_parts) if name_parts else hex_color
 
-        colors.append({"id": f"{i:03d}", "name": color_name, "color": hex_color})
+            colors.append({"id": f"{i:03d}", "name": color_name, "color": hex_color})
 
     return colors
 
@@ -227,44 +476,92 @@ def convert_file(input_file: str, output_file: str, cut: bool = False):
         print(f"❌ Colors not found in: {input_file}")
         return False
 
-    # Конвертируем
-    result = []
-    for item in colors:
-        try:
-            hex_color = item["color"]
-            rgb = hex_to_rgb(hex_color)
-
-            color_dict = {
-                "id": item["id"],
-                "name": item["name"],
-                "hex": hex_color,
-                "rgb": list(rgb),
-                "rgb_norm": [round(x / 255.0, 4) for x in rgb],
-                "hsl": list(rgb_to_hsl(rgb)),
+    # Конвертируем всю палитру батчами (SoA-массивы по компонентам),
+    # словари собираем единственным проходом в самом конце
+    ids = [item["id"] for item in colors]
+    names = [item["name"] for item in colors]
+    hex_list = [item["color"] for item in colors]
+
+    rgb_arr = hex_to_rgb_batch(hex_list)
+    norm_arr = NORM_LUT[rgb_arr]
+
+    # Повторы цветов считаем один раз: ядра гоняем по уникальным RGB,
+    # обратно разворачиваем индексами из np.unique
+    packed = (
+        (rgb_arr[:, 0].astype(np.uint32) << 16)
+        | (rgb_arr[:, 1].astype(np.uint32) << 8)
+        | rgb_arr[:, 2]
+    )
+    uniq, inv = np.unique(packed, return_inverse=True)
+    rgb_uniq = np.stack(
+        [(uniq >> 16) & 0xFF, (uniq >> 8) & 0xFF, uniq & 0xFF], axis=1
+    ).astype(np.uint8)
+
+    # Большие палитры считаем на GPU (CuPy): загружаем уникальные RGB
+    # один раз, выгружаем только готовые массивы результатов
+    use_gpu = cp is not None and rgb_uniq.shape[0] >= _GPU_MIN_COLORS
+    if use_gpu:
+        xp, rgb_dev, _host = cp, cp.asarray(rgb_uniq), cp.asnumpy
+    else:
+        xp, rgb_dev, _host = np, rgb_uniq, lambda a: a
+
+    hsl_arr = np.round(_host(rgb_to_hsl_batch(rgb_dev, xp)), 1)[inv]
+    if not cut:
+        hsv_arr = np.round(_host(rgb_to_hsv_batch(rgb_dev, xp)), 1)[inv]
+        lab_arr = np.round(_host(rgb_to_lab_batch(rgb_dev, xp)), 2)[inv]
+        cmyk_arr = np.round(_host(rgb_to_cmyk_batch(rgb_dev, xp)), 1)[inv]
+        lum = (rgb_uniq @ _LUMA_W)[inv]
+        light_arr = lum > 128
+        lum_arr = np.round(lum, 1)
+
+    # Конверсия в Python-объекты одним .tolist() на массив до цикла:
+    # внутри цикла остаются только индексации готовых списков
+    rgb_rows = rgb_arr.tolist()
+    norm_rows = norm_arr.tolist()
+    hsl_rows = hsl_arr.tolist()
+    if not cut:
+        hsv_rows = hsv_arr.tolist()
+        lab_rows = lab_arr.tolist()
+        cmyk_rows = cmyk_arr.tolist()
+        lum_vals = lum_arr.tolist()
+        light_vals = light_arr.tolist()
+
+    # Ветка cut вынесена из цикла: каждое тело собирает словарь одним литералом.
+    # try/except здесь не нужен: все цвета уже прошли normalize_hex/extract_hex,
+    # а списки выше построены одной длины
+    if cut:
+        result = [
+            {
+                "id": ids[i],
+                "name": names[i],
+                "hex": hex_list[i],
+                "rgb": rgb_rows[i],
+                "rgb_norm": norm_rows[i],
+                "hsl": hsl_rows[i],
+            }
+            for i in range(len(colors))
+        ]
+    else:
+        result = [
+            {
+                "id": ids[i],
+                "name": names[i],
+                "hex": hex_list[i],
+                "rgb": rgb_rows[i],
+                "rgb_norm": norm_rows[i],
+                "hsl": hsl_rows[i],
+                "hsv": hsv_rows[i],
+                "lab": lab_rows[i],
+                "cmyk": cmyk_rows[i],
+                "luminance": lum_vals[i],
+                "is_light": light_vals[i],
             }
+            for i in range(len(colors))
+        ]
 
-            if not cut:
-                color_dict.update(
-                    {
-                        "hsv": list(rgb_to_hsv(rgb)),
-                        "lab": list(rgb_to_lab(rgb)),
-                        "cmyk": list(rgb_to_cmyk(rgb)),
-                        "luminance": round(
-                            0.2126 * rgb[0] + 0.7152 * rgb[1] + 0.0722 * rgb[2], 1
-                        ),
-                        "is_light": 0.2126 * rgb[0] + 0.7152 * rgb[1] + 0.0722 * rgb[2]
-                        > 128,
-                    }
-                )
-
-            result.append(color_dict)
-
-        except Exception as e:
-            print(f"⚠️ Warning: Skipped color {item.get('name', '?')}: {e}")
-
-    # Сохраняем
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    # Сохраняем: сериализация в один буфер, одна запись на диск
+    with open(output_file, "wb", buffering=1 << 20) as f:
+        f.write(_dumps(result))
 
     # Выводим информацию
     print(f"Converted: {len(result)} colors")